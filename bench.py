@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+基准测试，遍历 test/example 下所有 PDF。
+
+  python bench.py [repeat]        # 单元格文本提取方式 chars / simple / layout 耗时
+  python bench.py memory [copies] # raw 短字符串去重与 span grid（slots）的每表内存开销
+
+提取基准中页面解析与 find_tables 只做一次，计时仅覆盖 table_to_html。
+"""
+
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import pdfplumber
+
+from ragtable_extract import Config, extract
+from ragtable_extract._core import EXTRACTION_MODES, compute_cell_spans, table_to_html
+from ragtable_extract._records import SpanCell, intern_raw
+
+EXAMPLE_DIR = Path(__file__).parent / "test" / "example"
+
+
+def _load_tables(pdf):
+    """预先解析页面与表格，返回 [(page, table, config), ...]。"""
+    items = []
+    for page in pdf.pages:
+        tables = page.find_tables()
+        if tables:
+            config = Config.from_page(page)
+            items.extend((page, t, config) for t in tables)
+    return items
+
+
+def _run(items, mode):
+    for page, _, _ in items:
+        # 清除页面级字符索引缓存，保证每轮计时包含建索引开销
+        page.__dict__.pop("_ragtable_char_index", None)
+    start = time.perf_counter()
+    for page, t, config in items:
+        table_to_html(page, t, config=config, extraction=mode)
+    return time.perf_counter() - start
+
+
+def _peak_memory(items, mode):
+    tracemalloc.start()
+    _run(items, mode)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def _fresh(s):
+    """复制字符串，模拟每份文档各自产生的新字符串对象。"""
+    return None if s is None else s.encode("utf-8").decode("utf-8")
+
+
+def _retained(build):
+    """build() 返回对象保留的内存（字节）。"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return after - before
+
+
+def bench_memory(copies: int):
+    """
+    模拟 copies 份文档的批量结果（约 copies × 示例页数 页）：
+    raw 字符串：每格各自一份 vs 每份文档内去重（intern_raw）；span grid：dict 单元格 vs SpanCell。
+    结果记录本身仍为 dict，html 字符串两边共享，均不计入。
+    """
+    tables = []
+    grids = []
+    for path in sorted(EXAMPLE_DIR.glob("*.pdf")):
+        tables.extend(extract(str(path)))
+        with pdfplumber.open(path) as pdf:
+            for page in pdf.pages:
+                grids.extend(compute_cell_spans(t) for t in page.find_tables())
+    n = len(tables) * copies
+
+    def old_raw():
+        return [[[_fresh(c) for c in row] for row in t["raw"]] for _ in range(copies) for t in tables]
+
+    def new_raw():
+        result = []
+        for _ in range(copies):
+            cache = {}
+            result.extend(intern_raw([[_fresh(c) for c in row] for row in t["raw"]], cache)
+                          for t in tables)
+        return result
+
+    def old_grids():
+        return [
+            [[None if c is None else {"bbox": c.bbox, "rowspan": c.rowspan, "colspan": c.colspan}
+              for c in row] for row in g]
+            for _ in range(copies) for g in grids
+        ]
+
+    def new_grids():
+        return [[[None if c is None else SpanCell(c.bbox, c.rowspan, c.colspan) for c in row]
+                 for row in g] for _ in range(copies) for g in grids]
+
+    print(f"{len(tables)} tables × {copies} copies")
+    print(f"{'':<12}{'before (B/table)':>18}{'after (B/table)':>18}")
+    for name, old, new in (("raw strings", old_raw, new_raw), ("span grid", old_grids, new_grids)):
+        before = _retained(old) / n
+        after = _retained(new) / n
+        print(f"{name:<12}{before:>18.0f}{after:>18.0f}")
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "memory":
+        bench_memory(int(sys.argv[2]) if len(sys.argv) > 2 else 50)
+        return
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    totals = {mode: 0.0 for mode in EXTRACTION_MODES}
+    print(f"{'PDF':<14}{'tables':>7}" + "".join(f"{m + ' (s)':>13}" for m in EXTRACTION_MODES))
+    for path in sorted(EXAMPLE_DIR.glob("*.pdf")):
+        with pdfplumber.open(path) as pdf:
+            items = _load_tables(pdf)
+            row = f"{path.name:<14}{len(items):>7}"
+            for mode in EXTRACTION_MODES:
+                elapsed = min(_run(items, mode) for _ in range(repeat))
+                totals[mode] += elapsed
+                row += f"{elapsed:>13.3f}"
+            print(row)
+    print(f"{'total':<21}" + "".join(f"{totals[m]:>13.3f}" for m in EXTRACTION_MODES))
+
+    path = max(EXAMPLE_DIR.glob("*.pdf"), key=lambda p: p.stat().st_size)
+    with pdfplumber.open(path) as pdf:
+        items = _load_tables(pdf)
+        peaks = {mode: _peak_memory(items, mode) / 1024 for mode in EXTRACTION_MODES}
+    print(f"\npeak memory on {path.name} (KiB): " + ", ".join(f"{m}={v:.0f}" for m, v in peaks.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,20 +5,33 @@ Extracting tables precisely. Convert to HTML. Fast, local, no GPU.
 """
 
 import os
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
+from ._async import aextract, aiter_tables
+from ._chunk import chunk_table, iter_chunks
 from ._config import Config, DEFAULT_CONFIG, compute_page_metrics
-from ._core import extract_tables_from_pdf
+from ._core import extract_tables_from_pdf, iter_tables_from_pdf
 from ._html import build_full_html
+from ._shard import merge_shards, plan_shards, run_shard
+from ._stitch import stitch_tables
 
 __version__ = "0.1.0"
 __all__ = [
     "convert",
     "extract",
+    "aextract",
+    "aiter_tables",
     "extract_tables_from_pdf",
+    "iter_tables_from_pdf",
+    "stitch_tables",
+    "iter_chunks",
+    "chunk_table",
     "build_full_html",
     "Config",
     "compute_page_metrics",
+    "plan_shards",
+    "run_shard",
+    "merge_shards",
 ]
 
 
@@ -62,6 +75,11 @@ def extract(
     pages: Optional[List[int]] = None,
     config: Optional[Config] = None,
     use_adaptive_config: bool = True,
+    stitch: bool = False,
+    regions: Optional[Dict[int, List[Tuple[float, float, float, float]]]] = None,
+    table_settings: Optional[dict] = None,
+    extraction: str = "chars",
+    dedup: Optional[str] = None,
 ) -> List[dict]:
     """
     Extract tables from PDF as structured data.
@@ -71,6 +89,17 @@ def extract(
         pages: Optional list of 1-based page numbers (default: all)
         config: Optional config; if None and use_adaptive_config=True, 从首页推算
         use_adaptive_config: 当 config 为 None 时，是否根据页面字符尺寸自适应
+        stitch: 是否合并跨页续表（额外返回 pages、bboxes、columns）
+        regions: {页码(1-based，同结果中 page): [bbox, ...]}，这些页只在区域内检测表格，
+            bbox 为页面坐标 (x0, top, x1, bottom)，可直接取自上一版文档的结果；
+            同页相互重叠的区域先合并为外接矩形再检测
+        table_settings: pdfplumber find_tables 参数；{页码(1-based): settings} 时逐页生效
+        extraction: 单元格文本提取方式，"chars"（默认，精确）、"simple"（轻量快速）、
+            "layout"（pdfplumber layout 模式，慢）
+        dedup: 重复表格去重（先比几何指纹，再比文本哈希，重复者不再提取）。
+            "reference"：重复处输出引用记录（duplicate_of=首表 table_id，html/raw 共享首表对象）；
+            "skip"：不输出重复表格。首表记录 table_id 与 shared_pages（共享该表的全部页码）；
+            shared_pages 在后续页遇到重复时原地追加，本函数返回时已完整
 
     Returns:
         List of dicts with keys: page, html, bbox, raw
@@ -80,10 +109,20 @@ def extract(
         >>> tables = ragtable_extract.extract(input_path="document.pdf")
         >>> config = ragtable_extract.Config(multiline_cell_top_range=25)
         >>> tables = ragtable_extract.extract("doc.pdf", config=config)
+        >>> prev = ragtable_extract.extract("last_edition.pdf")
+        >>> regions = {}
+        >>> for t in prev:
+        ...     regions.setdefault(t["page"], []).append(t["bbox"])
+        >>> tables = ragtable_extract.extract("this_edition.pdf", regions=regions)
     """
     return extract_tables_from_pdf(
         input_path,
         page_numbers=pages,
         config=config,
         use_adaptive_config=use_adaptive_config,
+        stitch=stitch,
+        regions=regions,
+        table_settings=table_settings,
+        extraction=extraction,
+        dedup=dedup,
     )
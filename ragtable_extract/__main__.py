@@ -1,13 +1,103 @@
-"""python -m ragtable_extract document.pdf output.html"""
+"""
+python -m ragtable_extract document.pdf output.html
+python -m ragtable_extract serve [--host H] [--port P] [--workers N]
+python -m ragtable_extract client document.pdf [output] [--pages 1-3,5] [--format json|html]
+python -m ragtable_extract shard plan|run|merge ...
+"""
 
+import argparse
 import sys
 
 from . import convert
+from ._server import DEFAULT_HOST, DEFAULT_PORT
+
+
+def _serve_main(argv):
+    from ._server import serve
+
+    parser = argparse.ArgumentParser(prog="python -m ragtable_extract serve")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=None, help="默认等于 CPU 核数")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+    serve(host=args.host, port=args.port, workers=args.workers, verbose=args.verbose)
+    return 0
+
+
+def _client_main(argv):
+    from ._server import client_main
+
+    parser = argparse.ArgumentParser(prog="python -m ragtable_extract client")
+    parser.add_argument("input")
+    parser.add_argument("output", nargs="?", default=None, help="默认输出到 stdout")
+    parser.add_argument("--pages", default=None, help="1-based 页码范围，如 1-3,5")
+    parser.add_argument("--format", choices=("json", "html"), default="json")
+    parser.add_argument("--upload", action="store_true", help="发送文件字节而非路径")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    return client_main(parser.parse_args(argv))
+
+
+def _shard_main(argv):
+    import os
+
+    from . import build_full_html
+    from ._shard import find_manifests, merge_shards, plan_shards, run_shard
+
+    parser = argparse.ArgumentParser(prog="python -m ragtable_extract shard")
+    sub = parser.add_subparsers(dest="action", required=True)
+    p_plan = sub.add_parser("plan", help="按估算成本切分页码范围并写出 manifest")
+    p_plan.add_argument("input")
+    p_plan.add_argument("output_dir")
+    p_plan.add_argument("--shards", type=int, required=True)
+    p_run = sub.add_parser("run", help="执行单个分片（已有结果则跳过）")
+    p_run.add_argument("manifest")
+    p_run.add_argument("--force", action="store_true")
+    p_merge = sub.add_parser("merge", help="合并全部分片结果为 HTML")
+    p_merge.add_argument("output_dir")
+    p_merge.add_argument("output")
+    args = parser.parse_args(argv)
+
+    if args.action == "plan":
+        for path in plan_shards(args.input, args.shards, args.output_dir):
+            print(path)
+    elif args.action == "run":
+        print(run_shard(args.manifest, force=args.force))
+    else:
+        try:
+            manifests = find_manifests(args.output_dir)
+            if not manifests:
+                raise FileNotFoundError(f"目录中没有分片 manifest: {args.output_dir}")
+            tables = merge_shards(manifests)
+        except (FileNotFoundError, ValueError) as e:
+            print(f"错误: {e}", file=sys.stderr)
+            return 1
+        pdf_name = os.path.basename(_read_manifest_pdf(manifests[0]))
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(build_full_html(pdf_name, tables))
+        print(f"Merged {len(tables)} tables from {len(manifests)} shards to {args.output}")
+    return 0
+
+
+def _read_manifest_pdf(manifest_path):
+    import json
+
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        return json.load(f)["pdf"]
+
+
+_SUBCOMMANDS = {"serve": _serve_main, "client": _client_main, "shard": _shard_main}
 
 
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] in _SUBCOMMANDS:
+        sys.exit(_SUBCOMMANDS[sys.argv[1]](sys.argv[2:]))
     if len(sys.argv) < 3:
         print("Usage: python -m ragtable_extract <input.pdf> <output.html>")
+        print("       python -m ragtable_extract serve [--host H] [--port P] [--workers N]")
+        print("       python -m ragtable_extract client <input.pdf> [output] [--pages 1-3,5]")
+        print("       python -m ragtable_extract shard plan|run|merge ...")
         sys.exit(1)
     input_path = sys.argv[1]
     output_path = sys.argv[2]
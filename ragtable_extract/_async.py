@@ -0,0 +1,146 @@
+"""asyncio-native extraction: page work runs on an executor, tables stream back."""
+
+import asyncio
+from collections import deque
+from concurrent.futures import Executor
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+import pdfplumber
+
+from ._config import Config
+from ._core import _Deduper, _extract_page_batch
+from ._dedup import DEDUP_MODES
+
+
+def _page_count(pdf_path: str) -> int:
+    with pdfplumber.open(pdf_path) as pdf:
+        return len(pdf.pages)
+
+
+async def aiter_tables(
+    input_path: str,
+    pages: Optional[List[int]] = None,
+    config: Optional[Config] = None,
+    use_adaptive_config: bool = True,
+    executor: Optional[Executor] = None,
+    max_pages_in_flight: int = 8,
+    progress: Optional[Callable[[int, int], None]] = None,
+    pages_per_task: int = 2,
+    regions: Optional[Dict[int, List[Tuple[float, float, float, float]]]] = None,
+    table_settings: Optional[Dict] = None,
+    extraction: str = "chars",
+    dedup: Optional[str] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    异步逐页提取表格，按页序产出，不阻塞事件循环。
+
+    Args:
+        input_path, pages, config, use_adaptive_config: 同 extract
+        executor: 页面任务所用执行器（ThreadPoolExecutor / ProcessPoolExecutor），
+            默认为事件循环的默认线程池
+        max_pages_in_flight: 同一文档同时提交的最大页数（背压）
+        progress: 每完成一批页面回调 progress(已完成页数, 总页数)，在事件循环线程中调用
+        pages_per_task: 每个执行器任务处理的连续页数，同一任务内只打开一次 PDF；
+            超过 max_pages_in_flight 时按其截断
+        regions, table_settings, extraction, dedup: 同 extract；dedup 在事件循环侧按页序完成，
+            结果与同步版本一致
+
+    取消（或提前关闭生成器）时，尚未开始的页面任务会被取消。
+
+    Example:
+        >>> async for t in ragtable_extract.aiter_tables("doc.pdf", max_pages_in_flight=2):
+        ...     await index.add(t["html"])
+    """
+    if dedup is not None and dedup not in DEDUP_MODES:
+        raise ValueError(f"dedup 必须是 {DEDUP_MODES} 之一: {dedup}")
+    loop = asyncio.get_running_loop()
+    if not pages:
+        total = await loop.run_in_executor(executor, _page_count, input_path)
+        pages = list(range(total))
+    total = len(pages)
+    finished = 0
+    limit = max(1, max_pages_in_flight)
+    # 批大小不超过页数上限，保证同时处理的页数不超过 max_pages_in_flight
+    size = max(1, min(pages_per_task, limit))
+    deduper = _Deduper(dedup) if dedup else None
+
+    def on_done(fut, count):
+        nonlocal finished
+        if fut.cancelled() or fut.exception() is not None:
+            return
+        finished += count
+        if progress is not None:
+            progress(finished, total)
+
+    def submit(batch):
+        fut = loop.run_in_executor(
+            executor,
+            _extract_page_batch,
+            input_path,
+            batch,
+            config,
+            use_adaptive_config,
+            regions,
+            table_settings,
+            extraction,
+            dedup,
+        )
+        fut.add_done_callback(lambda f: on_done(f, len(batch)))
+        return fut
+
+    pending = deque()
+    remaining = deque(pages[i:i + size] for i in range(0, total, size))
+    try:
+        while remaining and len(pending) < limit // size:
+            pending.append(submit(remaining.popleft()))
+        while pending:
+            items = await pending.popleft()
+            if remaining:
+                pending.append(submit(remaining.popleft()))
+            for pnum, bbox, geo, text_fp, record in items:
+                if deduper is not None:
+                    record = deduper.resolve(pnum, bbox, geo, text_fp, record)
+                if record is not None:
+                    yield record
+    finally:
+        for fut in pending:
+            fut.cancel()
+
+
+async def aextract(
+    input_path: str,
+    pages: Optional[List[int]] = None,
+    config: Optional[Config] = None,
+    use_adaptive_config: bool = True,
+    executor: Optional[Executor] = None,
+    max_pages_in_flight: int = 8,
+    progress: Optional[Callable[[int, int], None]] = None,
+    pages_per_task: int = 2,
+    regions: Optional[Dict[int, List[Tuple[float, float, float, float]]]] = None,
+    table_settings: Optional[Dict] = None,
+    extraction: str = "chars",
+    dedup: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    extract 的协程版本，参数同 aiter_tables，返回与 extract 相同的表格列表。
+
+    Example:
+        >>> tables = await ragtable_extract.aextract("doc.pdf")
+    """
+    return [
+        t
+        async for t in aiter_tables(
+            input_path,
+            pages=pages,
+            config=config,
+            use_adaptive_config=use_adaptive_config,
+            executor=executor,
+            max_pages_in_flight=max_pages_in_flight,
+            progress=progress,
+            pages_per_task=pages_per_task,
+            regions=regions,
+            table_settings=table_settings,
+            extraction=extraction,
+            dedup=dedup,
+        )
+    ]
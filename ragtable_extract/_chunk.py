@@ -0,0 +1,142 @@
+"""Size/token-bounded RAG chunks cut from the span grid (no HTML re-parse)."""
+
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from ._config import Config
+from ._core import _iter_pdf_tables, extract_table_cells, render_rows, rows_to_html
+from ._records import SpanCell
+
+
+def row_blocks(cell_grid: List[List[Optional[SpanCell]]]) -> List[Tuple[int, int]]:
+    """
+    将表格行划分为最小的 [start, end) 行块，保证任何 rowspan 都不跨块。
+    """
+    blocks = []
+    start, end = 0, 0
+    for i, row in enumerate(cell_grid):
+        end = max(end, i + 1)
+        for cell in row:
+            if cell is not None:
+                end = max(end, i + cell.rowspan)
+        if i + 1 >= end:
+            blocks.append((start, i + 1))
+            start = i + 1
+    if start < len(cell_grid):
+        blocks.append((start, len(cell_grid)))
+    return blocks
+
+
+def _rows_bbox(cell_grid, start: int, end: int) -> Optional[Tuple[float, float, float, float]]:
+    boxes = [c.bbox for row in cell_grid[start:end] for c in row if c is not None]
+    if not boxes:
+        return None
+    return (
+        min(b[0] for b in boxes),
+        min(b[1] for b in boxes),
+        max(b[2] for b in boxes),
+        max(b[3] for b in boxes),
+    )
+
+
+def chunk_table(
+    cell_grid: List[List[Optional[SpanCell]]],
+    max_size: int = 2000,
+    size_fn: Callable[[str], int] = len,
+    header_rows: Optional[int] = None,
+) -> Iterator[Dict]:
+    """
+    按大小预算把一张表切成若干行组，每组重复表头，rowspan 永不被切断。
+
+    Args:
+        cell_grid: extract_table_cells 的结果
+        max_size: 每个分块的预算（按 size_fn 计量）
+        size_fn: 计量函数，默认按字符数；传入 tokenizer 计数函数即为 token 预算
+        header_rows: 表头行数，默认（None）取首个行块（首行及其 rowspan 覆盖的行）；
+            传 0 表示无表头，分块不重复任何行
+
+    Yields:
+        dict: html, row_range（数据行 [start, end)，相对整表）, header_rows, bbox（数据行范围）
+        单个行块超出预算时单独成块。
+    """
+    rows = render_rows(cell_grid)
+    if not rows:
+        return
+    blocks = row_blocks(cell_grid)
+    if header_rows is None:
+        header_rows = blocks[0][1]
+    elif header_rows > 0:
+        # 表头必须落在行块边界上，否则向后取整
+        header_rows = next((e for _, e in blocks if e >= header_rows), len(rows))
+    else:
+        header_rows = 0
+    header = rows[:header_rows]
+    body_blocks = [(s, e) for s, e in blocks if s >= header_rows]
+    if not body_blocks:
+        yield {
+            "html": rows_to_html(header),
+            "row_range": (0, header_rows),
+            "header_rows": header_rows,
+            "bbox": _rows_bbox(cell_grid, 0, header_rows),
+        }
+        return
+
+    base_size = size_fn(rows_to_html(header))
+    chunk_start, chunk_end, size = None, None, base_size
+    for s, e in body_blocks:
+        block_size = sum(size_fn(r) + 1 for r in rows[s:e])
+        if chunk_start is not None and size + block_size > max_size:
+            yield _make_chunk(cell_grid, rows, header, header_rows, chunk_start, chunk_end)
+            chunk_start, size = None, base_size
+        if chunk_start is None:
+            chunk_start = s
+        chunk_end = e
+        size += block_size
+    yield _make_chunk(cell_grid, rows, header, header_rows, chunk_start, chunk_end)
+
+
+def _make_chunk(cell_grid, rows, header, header_rows, start, end) -> Dict:
+    return {
+        "html": rows_to_html(header + rows[start:end]),
+        "row_range": (start, end),
+        "header_rows": header_rows,
+        "bbox": _rows_bbox(cell_grid, start, end),
+    }
+
+
+def iter_chunks(
+    pdf_path: str,
+    page_numbers: Optional[List[int]] = None,
+    config: Optional[Config] = None,
+    use_adaptive_config: bool = True,
+    max_size: int = 2000,
+    size_fn: Callable[[str], int] = len,
+    regions: Optional[Dict[int, List[Tuple[float, float, float, float]]]] = None,
+    table_settings: Optional[Dict] = None,
+    extraction: str = "chars",
+    header_rows: Optional[int] = None,
+) -> Iterator[Dict]:
+    """
+    逐页提取表格并直接产出 RAG 分块，参数同 extract_tables_from_pdf / chunk_table。
+
+    header_rows 对每张表生效，0 表示无表头、分块不重复任何行。
+
+    Yields:
+        dict: page, table_index（文档内表格序号）, table_bbox, bbox, row_range, header_rows, html
+
+    Example:
+        >>> for c in ragtable_extract.iter_chunks("doc.pdf", max_size=512, size_fn=count_tokens):
+        ...     index.add(c["html"], meta={"page": c["page"], "rows": c["row_range"]})
+    """
+    for table_index, (pnum, page, t, page_config) in enumerate(
+        _iter_pdf_tables(
+            pdf_path, page_numbers, config, use_adaptive_config, regions, table_settings
+        )
+    ):
+        cell_grid = extract_table_cells(page, t, config=page_config, extraction=extraction)
+        for chunk in chunk_table(
+            cell_grid, max_size=max_size, size_fn=size_fn, header_rows=header_rows
+        ):
+            chunk["page"] = pnum + 1
+            chunk["table_index"] = table_index
+            chunk["table_bbox"] = t.bbox
+            yield chunk
@@ -1,15 +1,20 @@
 """Core PDF table extraction logic."""
 
 import html
+from bisect import bisect_left
 from operator import itemgetter
-from typing import List, Optional, Tuple, Dict, Any
+from typing import Iterator, List, Optional, Tuple, Dict, Any
 
 import pdfplumber
-from pdfplumber.utils import extract_text
+from pdfplumber.page import CroppedPage
+from pdfplumber.utils import crop_to_bbox, extract_text, intersects_bbox
 from pdfplumber.utils.clustering import cluster_objects
 
 from ._font import fix_special_symbols, get_special_font_y_tolerance
 from ._config import Config, DEFAULT_CONFIG
+from ._dedup import DEDUP_MODES, geometry_fingerprint, text_fingerprint
+from ._records import SpanCell, TableRecord, intern_raw
+from ._stitch import column_bounds, stitch_tables
 
 
 def _compute_y_tolerance(
@@ -131,7 +136,8 @@ def extract_cell_text_by_chars(
 
     tops = [c["top"] for c in cell_chars]
     top_range = max(tops) - min(tops) if tops else 0
-    base_tolerance = get_special_font_y_tolerance(page, config)
+    # 字体按整页判定：区域裁剪页可能恰好不含方正字符
+    base_tolerance = get_special_font_y_tolerance(getattr(page, "root_page", page), config)
     y_tolerance = _compute_y_tolerance(top_range, base_tolerance, config)
     lines_chars = cluster_objects(cell_chars, itemgetter("top"), y_tolerance)
     lines_chars = _reorder_chars_with_symbols(lines_chars, config)
@@ -141,7 +147,62 @@ def extract_cell_text_by_chars(
     return fix_special_symbols(text, config)
 
 
-def compute_cell_spans(table) -> List[List[Optional[Dict]]]:
+EXTRACTION_MODES = ("chars", "simple", "layout")
+
+
+class _CharIndex:
+    """按字符垂直中点排序的页面字符索引，单元格查询为二分 + 区间扫描。"""
+
+    def __init__(self, chars: List[dict]):
+        keyed = sorted(((c["top"] + c["bottom"]) / 2, i) for i, c in enumerate(chars))
+        self._v_mids = [k for k, _ in keyed]
+        self._chars = [chars[i] for _, i in keyed]
+
+    def query(self, bbox: Tuple[float, float, float, float]) -> List[dict]:
+        """返回中点落在 bbox 内的字符（左闭右开，与逐字符过滤一致）。"""
+        x0, top, x1, bottom = bbox
+        lo = bisect_left(self._v_mids, top)
+        hi = bisect_left(self._v_mids, bottom)
+        return [c for c in self._chars[lo:hi] if x0 <= (c["x0"] + c["x1"]) / 2 < x1]
+
+
+def _page_char_index(page) -> _CharIndex:
+    """每页只建一次索引，缓存在 page 对象上，供同页所有表格共享。"""
+    index = getattr(page, "_ragtable_char_index", None)
+    if index is None:
+        index = _CharIndex(page.chars)
+        page._ragtable_char_index = index
+    return index
+
+
+def extract_cell_text_simple(
+    page,
+    cell_bbox: Tuple[float, float, float, float],
+    config: Optional[Config] = None,
+) -> str:
+    """
+    轻量单元格文本提取：共享字符索引 + 简单行聚类，不做 layout 补白与符号重排。
+
+    比 chars 模式快，质量介于 chars 与 layout 之间。
+    """
+    config = config or DEFAULT_CONFIG
+    cell_chars = _page_char_index(page).query(cell_bbox)
+    if not cell_chars:
+        return ""
+    lines_chars = cluster_objects(cell_chars, itemgetter("top"), config.default_y_tolerance)
+    lines = []
+    for line in lines_chars:
+        parts, last_x1 = [], None
+        for c in sorted(line, key=itemgetter("x0")):
+            if last_x1 is not None and c["x0"] > last_x1 + config.char_spacing_tolerance:
+                parts.append(" ")
+            parts.append(c["text"])
+            last_x1 = c["x1"]
+        lines.append("".join(parts))
+    return fix_special_symbols("\n".join(lines), config)
+
+
+def compute_cell_spans(table) -> List[List[Optional[SpanCell]]]:
     rows = table.rows
     if not rows:
         return []
@@ -172,7 +233,7 @@ def compute_cell_spans(table) -> List[List[Optional[Dict]]]:
                 else:
                     break
 
-            result[i][j] = {"bbox": cell, "rowspan": rowspan, "colspan": colspan}
+            result[i][j] = SpanCell(cell, rowspan, colspan)
 
     return result
 
@@ -187,94 +248,402 @@ def _get_prev_cell_bottom(
             info = span_grid[ri][cj]
             if info is None:
                 continue
-            rs, cs = info["rowspan"], info["colspan"]
+            rs, cs = info.rowspan, info.colspan
             if ri <= row - 1 < ri + rs and cj <= col < cj + cs:
-                return info["bbox"][3]
+                return info.bbox[3]
     return None
 
 
-def table_to_html(
+_TABLE_OPEN = (
+    '<table border="1" cellpadding="4" cellspacing="0" style="border-collapse: collapse;">'
+)
+
+
+def extract_table_cells(
     page,
     table,
     use_char_extraction: bool = True,
     config: Optional[Config] = None,
-) -> str:
-    config = config or DEFAULT_CONFIG
-    span_grid = compute_cell_spans(table)
+    extraction: Optional[str] = None,
+    span_grid: Optional[List[List[Optional[SpanCell]]]] = None,
+) -> List[List[Optional[SpanCell]]]:
+    """
+    提取单元格文本，返回 span grid：每格为带 text 的 SpanCell（bbox / rowspan / colspan / text）。
 
-    html_parts = [
-        '<table border="1" cellpadding="4" cellspacing="0" style="border-collapse: collapse;">'
-    ]
+    被合并单元格覆盖的位置为 None；text 未做 HTML 转义。
+    extraction 为 "chars"（默认，逐字符精确提取）、"simple"（轻量）或 "layout"
+    （pdfplumber layout 模式）；未指定时按 use_char_extraction 取 chars / layout。
+    span_grid 为调用方已算好的 compute_cell_spans(table)，省略时在此计算。
+    """
+    config = config or DEFAULT_CONFIG
+    mode = extraction or ("chars" if use_char_extraction else "layout")
+    if mode not in EXTRACTION_MODES:
+        raise ValueError(f"extraction 必须是 {EXTRACTION_MODES} 之一: {mode}")
+    if span_grid is None:
+        span_grid = compute_cell_spans(table)
+    result = [[None] * len(row) for row in span_grid]
     used = set()
 
-    for i, row in enumerate(table.rows):
-        html_parts.append("<tr>")
+    for i in range(len(table.rows)):
         for j, cell_info in enumerate(span_grid[i]):
             if (i, j) in used:
                 continue
             if cell_info is None:
                 continue
 
-            bbox = cell_info["bbox"]
-            rowspan = cell_info["rowspan"]
-            colspan = cell_info["colspan"]
+            bbox = cell_info.bbox
+            rowspan = cell_info.rowspan
+            colspan = cell_info.colspan
 
-            if use_char_extraction:
+            if mode == "chars":
                 prev_bottom = _get_prev_cell_bottom(span_grid, i, j)
                 text = extract_cell_text_by_chars(
                     page, bbox, prev_cell_bottom=prev_bottom, config=config
                 )
+            elif mode == "simple":
+                text = extract_cell_text_simple(page, bbox, config=config)
             else:
-                cell_chars = [
-                    c
-                    for c in page.chars
-                    if (bbox[0] <= (c["x0"] + c["x1"]) / 2 < bbox[2])
-                    and (bbox[1] <= (c["top"] + c["bottom"]) / 2 < bbox[3])
-                ]
+                cell_chars = _page_char_index(page).query(bbox)
                 text = extract_text(cell_chars, layout=True) if cell_chars else ""
 
-            text = html.escape(text).replace("\n", "")
-
-            rs = f' rowspan="{rowspan}"' if rowspan > 1 else ""
-            cs = f' colspan="{colspan}"' if colspan > 1 else ""
-            html_parts.append(f"<td{rs}{cs}>{text}</td>")
+            result[i][j] = SpanCell(bbox, rowspan, colspan, text)
 
             for ii in range(i, i + rowspan):
                 for jj in range(j, j + colspan):
                     used.add((ii, jj))
 
-        html_parts.append("</tr>")
+    return result
 
-    html_parts.append("</table>")
-    return "\n".join(html_parts)
 
+def render_rows(cell_grid: List[List[Optional[SpanCell]]]) -> List[str]:
+    """将 extract_table_cells 的结果逐行渲染为 <tr>…</tr>。"""
+    rows = []
+    for row in cell_grid:
+        parts = ["<tr>"]
+        for cell in row:
+            if cell is None:
+                continue
+            text = html.escape(cell.text).replace("\n", "")
+            rs = f' rowspan="{cell.rowspan}"' if cell.rowspan > 1 else ""
+            cs = f' colspan="{cell.colspan}"' if cell.colspan > 1 else ""
+            parts.append(f"<td{rs}{cs}>{text}</td>")
+        parts.append("</tr>")
+        rows.append("\n".join(parts))
+    return rows
 
-def extract_tables_from_pdf(
+
+def rows_to_html(rows: List[str]) -> str:
+    return "\n".join([_TABLE_OPEN] + rows + ["</table>"])
+
+
+def table_to_html(
+    page,
+    table,
+    use_char_extraction: bool = True,
+    config: Optional[Config] = None,
+    extraction: Optional[str] = None,
+    span_grid: Optional[List[List[Optional[SpanCell]]]] = None,
+) -> str:
+    cell_grid = extract_table_cells(page, table, use_char_extraction, config, extraction, span_grid)
+    return rows_to_html(render_rows(cell_grid))
+
+
+def iter_tables_from_pdf(
     pdf_path: str,
     page_numbers: Optional[List[int]] = None,
     config: Optional[Config] = None,
     use_adaptive_config: bool = True,
-) -> List[Dict[str, Any]]:
-    result = []
+    stitch: bool = False,
+    regions: Optional[Dict[int, List[Tuple[float, float, float, float]]]] = None,
+    table_settings: Optional[Dict] = None,
+    extraction: str = "chars",
+    dedup: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    逐页流式提取表格，参数同 extract_tables_from_pdf。
+
+    stitch=True 时合并跨页续表（见 stitch_tables），记录额外包含 pages、bboxes、columns。
+    regions / table_settings / extraction / dedup 见 ragtable_extract.extract。
+    dedup 时首表先于其重复表产出，其 shared_pages 列表随后原地追加，迭代结束后才完整。
+    """
+    if dedup is not None and dedup not in DEDUP_MODES:
+        raise ValueError(f"dedup 必须是 {DEDUP_MODES} 之一: {dedup}")
+    records = _iter_page_tables(
+        pdf_path,
+        page_numbers,
+        config,
+        use_adaptive_config,
+        stitch,
+        regions,
+        table_settings,
+        extraction,
+        dedup,
+    )
+    return stitch_tables(records) if stitch else records
+
+
+def _clip_bbox(bbox, page_bbox) -> Optional[Tuple[float, float, float, float]]:
+    x0, top = max(bbox[0], page_bbox[0]), max(bbox[1], page_bbox[1])
+    x1, bottom = min(bbox[2], page_bbox[2]), min(bbox[3], page_bbox[3])
+    if x1 <= x0 or bottom <= top:
+        return None
+    return (x0, top, x1, bottom)
+
+
+def _merge_regions(bboxes):
+    """
+    将相互重叠的区域合并为其外接矩形，直至两两不重叠。
+
+    重叠区域各自检测会把同一张表输出两次（如上一版 bbox 与其外扩版本同时传入）。
+    """
+    merged = list(bboxes)
+    changed = True
+    while changed:
+        changed = False
+        for i in range(len(merged)):
+            for j in range(i + 1, len(merged)):
+                a, b = merged[i], merged[j]
+                if a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]:
+                    merged[i] = (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+                    del merged[j]
+                    changed = True
+                    break
+            if changed:
+                break
+    return merged
+
+
+def _crop_region(page, bbox) -> CroppedPage:
+    """
+    裁剪出检测区域：线条/矩形按 bbox 截断，字符只筛选不截断。
+
+    截断字符会移动其中点，把压在边界上的页脚等字符误纳入单元格。
+    """
+
+    def crop_fn(objs, crop_bbox):
+        if objs and objs[0].get("object_type") == "char":
+            return intersects_bbox(objs, crop_bbox)
+        return crop_to_bbox(objs, crop_bbox)
+
+    return CroppedPage(page, bbox, crop_fn=crop_fn)
+
+
+def _page_table_settings(table_settings: Optional[Dict], page_no: int) -> Optional[Dict]:
+    """table_settings 为 {页码: settings} 时逐页取值，否则对所有页生效。"""
+    if table_settings and all(isinstance(k, int) for k in table_settings):
+        return table_settings.get(page_no)
+    return table_settings
+
+
+def _iter_pdf_tables(
+    pdf_path, page_numbers, config, use_adaptive_config, regions=None, table_settings=None
+):
+    """
+    逐页产出 (页索引, page, table, 页配置)。
+
+    指定 regions 的页面只在裁剪出的子页面上检测表格与索引字符；
+    裁剪页沿用原页坐标，故 table.bbox 与单元格 bbox 无需换算。自适应配置仍按整页推算。
+    """
     with pdfplumber.open(pdf_path) as pdf:
         base_config = config or DEFAULT_CONFIG
         pages = page_numbers if page_numbers else range(len(pdf.pages))
         for pnum in pages:
             page = pdf.pages[pnum]
-            tables = page.find_tables()
+            settings = _page_table_settings(table_settings, pnum + 1)
+            page_regions = regions.get(pnum + 1) if regions else None
+            if page_regions is None:
+                targets = [page]
+            else:
+                clipped = [_clip_bbox(r, page.bbox) for r in page_regions]
+                merged = _merge_regions([b for b in clipped if b is not None])
+                targets = [_crop_region(page, b) for b in merged]
             page_config = (
                 Config.from_page(page, base=base_config)
                 if use_adaptive_config and config is None
                 else base_config
             )
-            for t in tables:
-                html_table = table_to_html(page, t, config=page_config)
-                result.append(
-                    {
-                        "page": pnum + 1,
-                        "bbox": t.bbox,
-                        "html": html_table,
-                        "raw": t.extract(),
-                    }
-                )
-    return result
+            for target in targets:
+                for t in target.find_tables(settings):
+                    yield pnum, target, t, page_config
+
+
+class _LazyTextFingerprint:
+    """文本指纹按需计算并缓存：几何指纹未曾撞车的表格不必哈希文本。"""
+
+    __slots__ = ("_page", "_bbox", "_value")
+
+    def __init__(self, page, bbox):
+        self._page = page
+        self._bbox = bbox
+        self._value = None
+
+    def __call__(self) -> str:
+        if self._value is None:
+            self._value = text_fingerprint(_page_char_index(self._page).query(self._bbox), self._bbox)
+            self._page = None
+        return self._value
+
+
+def _text_value(text_fp) -> str:
+    return text_fp() if callable(text_fp) else text_fp
+
+
+class _Deduper:
+    """
+    按页序处理去重：先比几何指纹，几何相同才比文本指纹。
+
+    首表编号 table_id，重复表追加到首表 shared_pages。
+    文本指纹可为字符串或 _LazyTextFingerprint（仅在几何撞车时计算）。
+    """
+
+    def __init__(self, mode: str):
+        self.mode = mode
+        self.groups: Dict[Tuple, List[Tuple[Any, TableRecord]]] = {}
+        self.count = 0
+
+    def find(self, geo, text_fp) -> Optional[TableRecord]:
+        """返回几何与文本均相同的首表记录，没有则返回 None。"""
+        group = self.groups.get(geo)
+        if not group:
+            return None
+        value = _text_value(text_fp)
+        return next((rec for fp, rec in group if _text_value(fp) == value), None)
+
+    def add(self, geo, text_fp, record: TableRecord, pnum: int):
+        record["table_id"] = self.count
+        record["shared_pages"] = [pnum + 1]
+        self.count += 1
+        self.groups.setdefault(geo, []).append((text_fp, record))
+
+    def duplicate(self, canonical: TableRecord, pnum: int, bbox) -> Optional[TableRecord]:
+        """登记共享页；返回应输出的引用记录，skip 模式下返回 None。"""
+        canonical["shared_pages"].append(pnum + 1)
+        if self.mode == "skip":
+            return None
+        ref = TableRecord(
+            pnum + 1,
+            bbox,
+            canonical["html"],
+            canonical["raw"],
+            duplicate_of=canonical["table_id"],
+        )
+        if "columns" in canonical:
+            ref["columns"] = canonical["columns"]
+        return ref
+
+    def resolve(self, pnum, bbox, geo, text_fp, record) -> Optional[TableRecord]:
+        """处理执行器返回的一项（record 为 None 表示批内重复）；返回应输出的记录。"""
+        canonical = self.find(geo, text_fp)
+        if canonical is not None:
+            return self.duplicate(canonical, pnum, bbox)
+        self.add(geo, text_fp, record, pnum)
+        return record
+
+
+def _table_record(pnum, page, t, page_config, span_grid, extraction, with_columns, strings):
+    html_table = table_to_html(
+        page, t, config=page_config, extraction=extraction, span_grid=span_grid
+    )
+    record = TableRecord(pnum + 1, t.bbox, html_table, intern_raw(t.extract(), strings))
+    if with_columns:
+        record["columns"] = column_bounds(span_grid)
+    return record
+
+
+def _iter_page_tables(
+    pdf_path,
+    page_numbers,
+    config,
+    use_adaptive_config,
+    with_columns,
+    regions=None,
+    table_settings=None,
+    extraction="chars",
+    dedup=None,
+):
+    deduper = _Deduper(dedup) if dedup else None
+    # 本次提取内共享的短字符串表，随生成器结束释放
+    strings: Dict[str, str] = {}
+    for pnum, page, t, page_config in _iter_pdf_tables(
+        pdf_path, page_numbers, config, use_adaptive_config, regions, table_settings
+    ):
+        # span grid 每表只算一次，指纹、提取与列边界共用
+        span_grid = compute_cell_spans(t)
+        if deduper is not None:
+            geo = geometry_fingerprint(t.bbox, span_grid)
+            text_fp = _LazyTextFingerprint(page, t.bbox)
+            canonical = deduper.find(geo, text_fp)
+            if canonical is not None:
+                # 重复表格：跳过提取，仅记录共享页
+                record = deduper.duplicate(canonical, pnum, t.bbox)
+                if record is not None:
+                    yield record
+                continue
+        record = _table_record(
+            pnum, page, t, page_config, span_grid, extraction, with_columns, strings
+        )
+        if deduper is not None:
+            deduper.add(geo, text_fp, record, pnum)
+        yield record
+
+
+def _extract_page_batch(
+    pdf_path,
+    page_numbers: List[int],
+    config: Optional[Config] = None,
+    use_adaptive_config: bool = True,
+    regions: Optional[Dict[int, List[Tuple[float, float, float, float]]]] = None,
+    table_settings: Optional[Dict] = None,
+    extraction: str = "chars",
+    dedup: Optional[str] = None,
+) -> List[Tuple[int, Tuple, Optional[Tuple], Optional[str], Optional[TableRecord]]]:
+    """
+    执行器任务：打开一次 PDF 处理一批页面，返回 [(页索引, bbox, 几何指纹, 文本指纹, 记录), ...]。
+
+    dedup 时批内重复表不提取（记录为 None），跨批去重由调用方用 _Deduper.resolve 按页序完成。
+    结果需跨进程传回，文本指纹在任务内全部算出，不能像同步路径那样按需计算。
+    """
+    items = []
+    seen: Dict[Tuple, set] = {}
+    strings: Dict[str, str] = {}
+    for pnum, page, t, page_config in _iter_pdf_tables(
+        pdf_path, page_numbers, config, use_adaptive_config, regions, table_settings
+    ):
+        span_grid = compute_cell_spans(t)
+        geo = text_fp = None
+        if dedup:
+            geo = geometry_fingerprint(t.bbox, span_grid)
+            text_fp = text_fingerprint(_page_char_index(page).query(t.bbox), t.bbox)
+            if text_fp in seen.get(geo, ()):
+                items.append((pnum, t.bbox, geo, text_fp, None))
+                continue
+            seen.setdefault(geo, set()).add(text_fp)
+        record = _table_record(pnum, page, t, page_config, span_grid, extraction, False, strings)
+        items.append((pnum, t.bbox, geo, text_fp, record))
+    return items
+
+
+def extract_tables_from_pdf(
+    pdf_path: str,
+    page_numbers: Optional[List[int]] = None,
+    config: Optional[Config] = None,
+    use_adaptive_config: bool = True,
+    stitch: bool = False,
+    regions: Optional[Dict[int, List[Tuple[float, float, float, float]]]] = None,
+    table_settings: Optional[Dict] = None,
+    extraction: str = "chars",
+    dedup: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    return list(
+        iter_tables_from_pdf(
+            pdf_path,
+            page_numbers=page_numbers,
+            config=config,
+            use_adaptive_config=use_adaptive_config,
+            stitch=stitch,
+            regions=regions,
+            table_settings=table_settings,
+            extraction=extraction,
+            dedup=dedup,
+        )
+    )
@@ -0,0 +1,46 @@
+"""Fingerprints for deduplicating repeated tables across a document."""
+
+import hashlib
+from typing import List, Optional, Tuple
+
+from ._records import SpanCell
+
+DEDUP_MODES = ("reference", "skip")
+
+
+def geometry_fingerprint(
+    bbox: Tuple[float, float, float, float],
+    span_grid: List[List[Optional[SpanCell]]],
+    precision: float = 1.0,
+) -> Tuple:
+    """
+    廉价几何指纹：表格宽高 + 各单元格相对位置与 rowspan/colspan，按 precision(pt) 取整。
+
+    相对 bbox 左上角计算，同一模板表格出现在不同页的不同位置时指纹相同。
+    """
+    x0, top, x1, bottom = bbox
+
+    def q(v):
+        return round(v / precision)
+
+    cells = tuple(
+        (i, j, q(c.bbox[0] - x0), q(c.bbox[1] - top), c.rowspan, c.colspan)
+        for i, row in enumerate(span_grid)
+        for j, c in enumerate(row)
+        if c is not None
+    )
+    return (q(x1 - x0), q(bottom - top), cells)
+
+
+def text_fingerprint(
+    chars: List[dict], bbox: Tuple[float, float, float, float], precision: float = 1.0
+) -> str:
+    """表格内字符文本及其相对位置的哈希，几何指纹相同时再比较。"""
+    x0, top = bbox[0], bbox[1]
+    h = hashlib.blake2b(digest_size=16)
+    for c in sorted(chars, key=lambda c: (round(c["top"] - top), c["x0"])):
+        h.update(
+            f'{c["text"]}\x00{round((c["x0"] - x0) / precision)}'
+            f'\x00{round((c["top"] - top) / precision)}\x01'.encode("utf-8")
+        )
+    return h.hexdigest()
@@ -0,0 +1,101 @@
+"""Result records: slotted span cells and dict-based table records."""
+
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# 不超过此长度的单元格文本会去重，同一次提取中的重复短字符串只保留一份
+INTERN_MAX_LEN = 32
+
+
+def intern_raw(
+    raw: List[List[Optional[str]]], cache: Optional[Dict[str, str]] = None
+) -> List[List[Optional[str]]]:
+    """
+    原地去重表格 raw 中的短字符串，返回同一对象。
+
+    cache 为调用方持有的字符串表，在一次提取内跨表共享，提取结束即可释放；
+    不用 sys.intern，因为 CPython 3.12 中被 intern 的字符串不会回收，常驻进程会持续增长。
+    """
+    if cache is None:
+        cache = {}
+    for row in raw:
+        for j, cell in enumerate(row):
+            if type(cell) is str and len(cell) <= INTERN_MAX_LEN:
+                row[j] = cache.setdefault(cell, cell)
+    return raw
+
+
+class SpanCell(MutableMapping):
+    """
+    span grid 单元格：bbox / rowspan / colspan（及提取后的 text）。
+
+    内部代码用属性访问；cell["rowspan"]、dict(cell) 等旧式用法保持可用。
+    """
+
+    __slots__ = ("bbox", "rowspan", "colspan", "text")
+    _KEYS = ("bbox", "rowspan", "colspan", "text")
+
+    def __init__(
+        self,
+        bbox: Tuple[float, float, float, float],
+        rowspan: int,
+        colspan: int,
+        text: Optional[str] = None,
+    ):
+        self.bbox = bbox
+        self.rowspan = rowspan
+        self.colspan = colspan
+        self.text = text
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._KEYS and (key != "text" or self.text is not None):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any):
+        if key not in self._KEYS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __delitem__(self, key: str):
+        if key != "text":
+            raise KeyError(key)
+        self.text = None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._KEYS if self.text is not None else self._KEYS[:3])
+
+    def __len__(self) -> int:
+        return 3 if self.text is None else 4
+
+    def __repr__(self) -> str:
+        return f"SpanCell({dict(self)!r})"
+
+
+class TableRecord(dict):
+    """
+    单张表格结果，即普通 dict（page / bbox / html / raw 及 stitch、dedup 等附加键）。
+
+    继承 dict 以保证 json.dumps、isinstance(t, dict) 等现有用法不变，
+    记录本身不比 dict 更省内存；raw 的字符串去重见 intern_raw。
+    """
+
+    __slots__ = ()
+
+    def __init__(
+        self,
+        page: int,
+        bbox: Tuple[float, float, float, float],
+        html: str,
+        raw: List[List[Optional[str]]],
+        **extra: Any,
+    ):
+        super().__init__(page=page, bbox=bbox, html=html, raw=raw, **extra)
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "TableRecord":
+        extra = {k: v for k, v in d.items() if k not in ("page", "bbox", "html", "raw")}
+        return cls(d["page"], d["bbox"], d["html"], d["raw"], **extra)
+
+    def copy(self) -> "TableRecord":
+        return TableRecord.from_dict(self)
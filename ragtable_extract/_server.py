@@ -0,0 +1,259 @@
+"""Warm worker service: ``python -m ragtable_extract serve`` / ``client``.
+
+服务端常驻进程池（fork 后已完成 import），客户端只发送路径或 PDF 字节，
+批量脚本处理成千上万个文件时只需付一次启动开销。
+"""
+
+import base64
+import io
+import json
+import os
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+from urllib import error as urlerror
+from urllib import request as urlrequest
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+def parse_page_range(spec: Optional[str]) -> Optional[List[int]]:
+    """
+    解析 1-based 页码范围（如 "1-3,5"），返回 0-based 页索引列表。
+
+    空字符串或 None 返回 None，表示全部页面。
+    """
+    if not spec:
+        return None
+    pages = []
+    for part in str(spec).split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = part.split("-", 1)
+            first, last = int(start), int(end)
+        else:
+            first = last = int(part)
+        if first < 1 or last < first:
+            raise ValueError(f"无效页码范围: {part}")
+        pages.extend(range(first - 1, last))
+    return pages or None
+
+
+class PageRangeError(ValueError):
+    """请求的页码超出文档页数，服务端返回 400。"""
+
+
+def _extract_job(source, pages, fmt: str, filename: str):
+    """进程池任务：source 为路径或 PDF 字节。"""
+    import pdfplumber
+
+    from . import build_full_html, extract
+
+    def _open():
+        return io.BytesIO(source) if isinstance(source, bytes) else source
+
+    if pages:
+        with pdfplumber.open(_open()) as pdf:
+            count = len(pdf.pages)
+        if max(pages) >= count:
+            raise PageRangeError(f"页码超出范围: 文档共 {count} 页")
+    tables = extract(_open(), pages=pages)
+    if fmt == "html":
+        return build_full_html(filename, tables)
+    return [
+        {"page": t["page"], "bbox": list(t["bbox"]), "html": t["html"], "raw": t["raw"]}
+        for t in tables
+    ]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "ragtable-extract"
+
+    def log_message(self, fmt, *args):
+        if self.server.verbose:
+            super().log_message(fmt, *args)
+
+    def _send(self, status: int, body: str, content_type: str = "application/json"):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_json(self, status: int, obj):
+        self._send(status, json.dumps(obj, ensure_ascii=False))
+
+    def do_GET(self):
+        if self.path != "/health":
+            return self._send_json(404, {"error": "not found"})
+        self._send_json(200, {"status": "ok", "workers": self.server.workers})
+
+    def do_POST(self):
+        if self.path != "/extract":
+            return self._send_json(404, {"error": "not found"})
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(payload, dict):
+                raise ValueError("请求体应为 JSON 对象")
+            fmt = payload.get("format", "json")
+            if fmt not in ("json", "html"):
+                raise ValueError(f"不支持的输出格式: {fmt}")
+            pages = parse_page_range(payload.get("pages"))
+            if payload.get("data"):
+                source = base64.b64decode(payload["data"])
+                filename = payload.get("filename") or "upload.pdf"
+            elif payload.get("path"):
+                source = payload["path"]
+                if not os.path.exists(source):
+                    raise ValueError(f"文件不存在: {source}")
+                filename = payload.get("filename") or os.path.basename(source)
+            else:
+                raise ValueError("缺少 path 或 data")
+        except (ValueError, TypeError) as e:
+            return self._send_json(400, {"error": str(e)})
+
+        try:
+            result = self.server.pool.apply(_extract_job, (source, pages, fmt, filename))
+        except PageRangeError as e:
+            return self._send_json(400, {"error": str(e)})
+        except Exception as e:
+            return self._send_json(500, {"error": str(e)})
+
+        if fmt == "html":
+            self._send(200, result, "text/html")
+        else:
+            self._send_json(200, {"filename": filename, "tables": result})
+
+
+def make_server(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    workers: Optional[int] = None,
+    verbose: bool = False,
+) -> ThreadingHTTPServer:
+    """
+    创建绑定好端口与进程池的服务（尚未开始处理请求）。
+
+    port 为 0 时由系统分配，实际端口见 server.server_address[1]；
+    使用完毕后调用 close_server 释放端口与进程池。
+    """
+    import multiprocessing
+
+    workers = workers or os.cpu_count() or 1
+    httpd = ThreadingHTTPServer((host, port), _Handler)
+    httpd.daemon_threads = True
+    httpd.pool = multiprocessing.Pool(processes=workers)
+    httpd.workers = workers
+    httpd.verbose = verbose
+    return httpd
+
+
+def close_server(httpd: ThreadingHTTPServer):
+    """关闭监听 socket 并终止进程池。"""
+    httpd.server_close()
+    httpd.pool.terminate()
+    httpd.pool.join()
+
+
+def serve(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    workers: Optional[int] = None,
+    verbose: bool = False,
+):
+    """
+    启动常驻提取服务（阻塞直至 Ctrl-C）。
+
+    Args:
+        host: 监听地址，默认仅本机
+        port: 监听端口
+        workers: 预 fork 的工作进程数，默认等于 CPU 核数
+        verbose: 是否打印访问日志
+    """
+    httpd = make_server(host, port, workers, verbose)
+    print(f"ragtable-extract serving on http://{host}:{httpd.server_address[1]} ({httpd.workers} workers)")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        close_server(httpd)
+
+
+def request_extract(
+    input_path: str,
+    pages: Optional[str] = None,
+    fmt: str = "json",
+    upload: bool = False,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    timeout: Optional[float] = None,
+):
+    """
+    向常驻服务发送一次提取请求。
+
+    Args:
+        input_path: PDF 路径
+        pages: 1-based 页码范围，如 "1-3,5"（默认全部）
+        fmt: "json" 返回表格列表，"html" 返回完整 HTML 文档
+        upload: True 时发送文件字节（服务端无法访问该路径时使用），否则发送绝对路径
+        host, port: 服务地址
+        timeout: 请求超时秒数
+
+    Returns:
+        fmt="json" 时为表格 dict 列表，fmt="html" 时为 HTML 字符串
+    """
+    payload = {"format": fmt, "pages": pages, "filename": os.path.basename(input_path)}
+    if upload:
+        with open(input_path, "rb") as f:
+            payload["data"] = base64.b64encode(f.read()).decode("ascii")
+    else:
+        payload["path"] = os.path.abspath(input_path)
+    req = urlrequest.Request(
+        f"http://{host}:{port}/extract",
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+    )
+    try:
+        with urlrequest.urlopen(req, timeout=timeout) as resp:
+            body = resp.read().decode("utf-8")
+    except urlerror.HTTPError as e:
+        detail = e.read().decode("utf-8", "replace")
+        try:
+            detail = json.loads(detail)["error"]
+        except (ValueError, KeyError):
+            pass
+        raise RuntimeError(f"服务端错误 ({e.code}): {detail}") from None
+    if fmt == "html":
+        return body
+    return json.loads(body)["tables"]
+
+
+def client_main(args) -> int:
+    """client 子命令入口，结果写入 output 或 stdout。"""
+    try:
+        result = request_extract(
+            args.input,
+            pages=args.pages,
+            fmt=args.format,
+            upload=args.upload,
+            host=args.host,
+            port=args.port,
+        )
+    except (OSError, RuntimeError) as e:
+        print(f"错误: {e}", file=sys.stderr)
+        return 1
+    text = result if args.format == "html" else json.dumps(result, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+        if args.format == "json":
+            print(f"Extracted {len(result)} tables to {args.output}")
+    else:
+        sys.stdout.write(text)
+    return 0
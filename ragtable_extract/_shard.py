@@ -0,0 +1,206 @@
+"""Page-range sharding for multi-node runs: plan → run (per shard) → merge."""
+
+import hashlib
+import json
+import os
+from bisect import bisect_left
+from itertools import accumulate
+from typing import Any, List
+
+import pdfplumber
+
+from ._core import extract_tables_from_pdf
+from ._records import TableRecord
+
+SHARD_PREFIX = "shard_"
+MANIFEST_SUFFIX = ".manifest.json"
+RESULT_SUFFIX = ".result.json"
+
+
+def estimate_page_costs(pdf_path: str) -> List[float]:
+    """
+    廉价预扫描：按字符数 + 线条/矩形数估算每页提取成本。
+
+    不调用 find_tables，仅解析页面对象；空页记为 1，避免切分时被忽略。
+    """
+    costs = []
+    with pdfplumber.open(pdf_path) as pdf:
+        for page in pdf.pages:
+            costs.append(float(len(page.chars) + len(page.lines) + len(page.rects) or 1))
+            page.close()
+    return costs
+
+
+def split_balanced(costs: List[float], num_shards: int) -> List[List[int]]:
+    """
+    将页面按成本切分为连续、均衡的 [start, end) 区间（0-based）。
+
+    每个分片至少一页，分片数不超过页数。每次切分后按剩余成本重新计算目标，
+    避免前面某页成本过高、切点被钳制后剩余页面分配失衡。
+    """
+    n = len(costs)
+    num_shards = max(1, min(num_shards, n))
+    if n == 0:
+        return []
+    prefix = list(accumulate(costs))
+    total = prefix[-1]
+    bounds = [0]
+    for k in range(1, num_shards):
+        done = prefix[bounds[-1] - 1] if bounds[-1] else 0.0
+        target = done + (total - done) / (num_shards - k + 1)
+        i = bisect_left(prefix, target)
+        # 取更接近目标的一侧作为切点
+        if i > 0 and target - prefix[i - 1] < prefix[i] - target:
+            i -= 1
+        cut = i + 1
+        lo = bounds[-1] + 1
+        hi = n - (num_shards - k)
+        bounds.append(min(max(cut, lo), hi))
+    bounds.append(n)
+    return [[bounds[k], bounds[k + 1]] for k in range(num_shards)]
+
+
+def plan_shards(
+    pdf_path: str,
+    num_shards: int,
+    output_dir: str,
+    use_adaptive_config: bool = True,
+) -> List[str]:
+    """
+    规划分片并写出 manifest 文件。
+
+    输出目录中已有的 shard_* 文件（旧 manifest 与结果）会先被删除，
+    避免 find_manifests / merge 混入上一次规划的分片。
+
+    Args:
+        pdf_path: PDF 路径（各节点需能以同一路径访问）
+        num_shards: 目标分片数
+        output_dir: manifest 与结果文件目录
+        use_adaptive_config: 透传给各分片的 extract_tables_from_pdf
+
+    Returns:
+        manifest 文件路径列表，按页序排列
+    """
+    costs = estimate_page_costs(pdf_path)
+    ranges = split_balanced(costs, num_shards)
+    digest = file_digest(pdf_path)
+    os.makedirs(output_dir, exist_ok=True)
+    for name in os.listdir(output_dir):
+        if name.startswith(SHARD_PREFIX):
+            os.remove(os.path.join(output_dir, name))
+    paths = []
+    for idx, (start, end) in enumerate(ranges):
+        name = f"{SHARD_PREFIX}{idx:04d}"
+        manifest = {
+            "pdf": os.path.abspath(pdf_path),
+            "pdf_digest": digest,
+            "shard": idx,
+            "num_shards": len(ranges),
+            "pages": [start, end],
+            "cost": sum(costs[start:end]),
+            "use_adaptive_config": use_adaptive_config,
+            "result": name + RESULT_SUFFIX,
+        }
+        path = os.path.join(output_dir, name + MANIFEST_SUFFIX)
+        _write_json(path, manifest)
+        paths.append(path)
+    return paths
+
+
+def run_shard(manifest_path: str, force: bool = False) -> str:
+    """
+    执行单个分片，结果原子写入 manifest 同目录。
+
+    已有与 manifest 一致（pdf、内容摘要、pages 相同）的结果时直接跳过（除非 force），
+    因此失败的分片可单独重跑；结果来自旧的规划时重新执行。
+    PDF 内容与规划时不同（文件被替换）时抛出 ValueError，需重新规划。
+
+    Returns:
+        结果文件路径
+    """
+    manifest = _read_json(manifest_path)
+    result_path = _result_path(manifest_path, manifest)
+    if file_digest(manifest["pdf"]) != manifest["pdf_digest"]:
+        raise ValueError(f"PDF 内容已变化，请重新规划分片: {manifest['pdf']}")
+    if not force and os.path.exists(result_path) and _result_matches(manifest, _read_json(result_path)):
+        return result_path
+    start, end = manifest["pages"]
+    tables = extract_tables_from_pdf(
+        manifest["pdf"],
+        page_numbers=list(range(start, end)),
+        use_adaptive_config=manifest.get("use_adaptive_config", True),
+    )
+    _write_json(
+        result_path,
+        {
+            "pdf": manifest["pdf"],
+            "pdf_digest": manifest["pdf_digest"],
+            "shard": manifest["shard"],
+            "pages": manifest["pages"],
+            "tables": [dict(t, bbox=list(t["bbox"])) for t in tables],
+        },
+    )
+    return result_path
+
+
+def merge_shards(manifest_paths: List[str]) -> List[TableRecord]:
+    """
+    按页序合并各分片结果，得到与单次运行相同的表格列表。
+
+    任一分片缺少结果时抛出 FileNotFoundError；结果与 manifest 不一致
+    （来自旧的规划）时抛出 ValueError。
+    """
+    shards = []
+    for path in manifest_paths:
+        manifest = _read_json(path)
+        result_path = _result_path(path, manifest)
+        if not os.path.exists(result_path):
+            raise FileNotFoundError(f"分片 {manifest['shard']} 尚无结果: {result_path}")
+        data = _read_json(result_path)
+        if not _result_matches(manifest, data):
+            raise ValueError(f"分片 {manifest['shard']} 的结果与 manifest 不一致，请重新执行: {result_path}")
+        shards.append((manifest["pages"][0], data["tables"]))
+    result = []
+    for _, tables in sorted(shards, key=lambda s: s[0]):
+        for t in tables:
+            t["bbox"] = tuple(t["bbox"])
+            result.append(TableRecord.from_dict(t))
+    return result
+
+
+def file_digest(path: str, chunk_size: int = 1 << 20) -> str:
+    """文件内容摘要（blake2b），用于识别同一路径下被替换的 PDF。"""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def find_manifests(output_dir: str) -> List[str]:
+    """列出目录下全部 manifest 文件。"""
+    return sorted(
+        os.path.join(output_dir, name)
+        for name in os.listdir(output_dir)
+        if name.endswith(MANIFEST_SUFFIX)
+    )
+
+
+def _result_path(manifest_path: str, manifest: dict) -> str:
+    return os.path.join(os.path.dirname(os.path.abspath(manifest_path)), manifest["result"])
+
+
+def _result_matches(manifest: dict, result: dict) -> bool:
+    return all(result.get(k) == manifest.get(k) for k in ("pdf", "pdf_digest", "pages"))
+
+
+def _read_json(path: str) -> Any:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_json(path: str, obj: Any):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False)
+    os.replace(tmp, path)
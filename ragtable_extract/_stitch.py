@@ -0,0 +1,132 @@
+"""Cross-page table continuation stitching (streaming)."""
+
+import re
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from ._records import SpanCell
+
+_ROWSPAN_RE = re.compile(r'rowspan="(\d+)"')
+
+
+def column_bounds(span_grid: List[List[Optional[SpanCell]]]) -> List[float]:
+    """由 compute_cell_spans 的单元格 bbox 得到表格全部列边界 x 坐标（升序）。"""
+    xs = set()
+    for row in span_grid:
+        for info in row:
+            if info is not None:
+                xs.add(info.bbox[0])
+                xs.add(info.bbox[2])
+    return sorted(xs)
+
+
+def _columns_match(a: List[float], b: List[float], x_tolerance: float) -> bool:
+    """
+    平移归一化后比较列边界：奇偶页边距不同，整表常整体平移数 pt。
+
+    总宽一致且一方的边界是另一方的子集即视为匹配（续表常多/少一条内部竖线）。
+    """
+    if not a or not b:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+    na = [x - a[0] for x in a]
+    nb = [x - b[0] for x in b]
+    if abs(na[-1] - nb[-1]) > x_tolerance:
+        return False
+    return all(any(abs(x - y) <= x_tolerance for y in nb) for x in na)
+
+
+def _strip_row(row: List[Optional[str]]) -> List[Optional[str]]:
+    """去掉合并单元格产生的 None 占位，列数不同的表头也可比较。"""
+    return [c for c in row if c is not None]
+
+
+def _header_match(open_raw: List[List], frag_raw: List[List], k: int) -> bool:
+    if k > len(open_raw) or k > len(frag_raw):
+        return False
+    return all(_strip_row(a) == _strip_row(b) for a, b in zip(open_raw[:k], frag_raw[:k]))
+
+
+def _split_rows(table_html: str) -> List[str]:
+    """将 table_to_html 输出拆为 <tr>…</tr> 片段列表。"""
+    body = table_html.split("\n", 1)[1].rsplit("\n</table>", 1)[0]
+    return [r + "</tr>" for r in body.split("</tr>") if r.strip()]
+
+
+def _header_row_count(rows: List[str]) -> int:
+    """表头行数：首行及被其 rowspan 覆盖的行，直到没有单元格跨出该范围。"""
+    k, r = 1, 0
+    while r < k and r < len(rows):
+        spans = [int(s) for s in _ROWSPAN_RE.findall(rows[r])]
+        k = max(k, r + max(spans, default=1))
+        r += 1
+    return k
+
+
+def _is_continuation(
+    open_table: Dict, frag: Dict, frag_rows: List[str], x_tolerance: float, max_top: float
+) -> bool:
+    """
+    续表判定：位于下一页，且重复了前表表头；或列边界匹配且位于页面顶部附近。
+
+    仅凭列网格可能误合并相邻页上恰好同网格的无关表格，故不重复表头时要求续表贴近页顶。
+    """
+    if (
+        frag["page"] != open_table["pages"][-1] + 1
+        or "duplicate_of" in frag
+        or "duplicate_of" in open_table
+    ):
+        return False
+    if _header_match(open_table["raw"], frag["raw"], _header_row_count(frag_rows)):
+        return True
+    if "columns" not in open_table or "columns" not in frag:
+        return False
+    return frag["bbox"][1] <= max_top and _columns_match(
+        open_table["columns"], frag["columns"], x_tolerance
+    )
+
+
+def _merge(open_table: Dict, frag: Dict, frag_rows: List[str]) -> None:
+    k = _header_row_count(frag_rows)
+    if k < len(frag_rows) and _header_match(open_table["raw"], frag["raw"], k):
+        # 续表重复表头：丢弃，避免 RAG 侧重复嵌入
+        frag_rows = frag_rows[k:]
+        frag_raw = frag["raw"][k:]
+    else:
+        frag_raw = frag["raw"]
+    head, _ = open_table["html"].rsplit("\n</table>", 1)
+    open_table["html"] = "\n".join([head] + [r.strip("\n") for r in frag_rows] + ["</table>"])
+    open_table["raw"] = open_table["raw"] + frag_raw
+    open_table["pages"].append(frag["page"])
+    open_table["bboxes"].append(frag["bbox"])
+
+
+def stitch_tables(
+    tables: Iterable[Dict], x_tolerance: float = 3.0, max_top: float = 150.0
+) -> Iterator[Dict]:
+    """
+    将跨页续表合并为一张逻辑表格，逐条产出。
+
+    仅在内存中保留当前未闭合的表格。合并条件：续表位于下一页、是该页第一张表、
+    前表是上一页最后一张表，且续表首行（去掉 None 占位后）重复了前表表头；
+    或两者列边界一致/互为子集（允许整体平移）且续表顶部 y 不超过 max_top。
+    续表重复的表头行会被去掉。去重产生的引用记录（带 duplicate_of）不参与合并。
+
+    可直接用于 extract() 的结果；带 "columns" 键（见 column_bounds，
+    iter_tables_from_pdf(stitch=True) 的中间记录）时才启用列边界匹配。
+    输出额外包含 "pages"、"bboxes"（各片段所在页及 bbox），"page"/"bbox" 取首个片段。
+    """
+    open_table = None
+    for t in tables:
+        if open_table is not None:
+            frag_rows = _split_rows(t["html"])
+            if _is_continuation(open_table, t, frag_rows, x_tolerance, max_top):
+                _merge(open_table, t, frag_rows)
+                continue
+        if open_table is not None:
+            yield open_table
+        open_table = t.copy()
+        open_table["pages"] = [t["page"]]
+        open_table["bboxes"] = [t["bbox"]]
+    if open_table is not None:
+        yield open_table
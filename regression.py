@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+黄金输出回归 + 吞吐量门禁：提取 test/example 下所有 PDF，与 test/result 中的期望 HTML
+逐单元格比对，并记录 pages/s。
+
+  python regression.py                      # 比对 + 吞吐量检查，失败时退出码为 1
+  python regression.py --tolerance 0.3      # 吞吐量低于基线 70% 视为失败
+  python regression.py --update-baseline    # 以本机当前吞吐量更新基线
+  python regression.py --update-golden      # 以当前输出覆盖黄金文件（确认输出变化后使用）
+
+吞吐量基线与机器相关，保存在 test/result/throughput.json。
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import pdfplumber
+
+import ragtable_extract
+
+ROOT = Path(__file__).parent
+EXAMPLE_DIR = ROOT / "test" / "example"
+RESULT_DIR = ROOT / "test" / "result"
+BASELINE_PATH = RESULT_DIR / "throughput.json"
+DEFAULT_TOLERANCE = 0.5
+
+# 单元格：(文本, rowspan, colspan)
+Cell = Tuple[str, int, int]
+
+
+class _TableParser(HTMLParser):
+    """从 build_full_html 输出中解析出 [(页码, [[Cell, ...], ...]), ...]。"""
+
+    def __init__(self):
+        super().__init__()
+        self.tables: List[Tuple[int, List[List[Cell]]]] = []
+        self._page = 0
+        self._in_h2 = False
+        self._h2_text = ""
+        self._cell = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "h2":
+            self._in_h2, self._h2_text = True, ""
+        elif tag == "table":
+            self.tables.append((self._page, []))
+        elif tag == "tr" and self.tables:
+            self.tables[-1][1].append([])
+        elif tag in ("td", "th"):
+            self._cell = ["", int(attrs.get("rowspan") or 1), int(attrs.get("colspan") or 1)]
+
+    def handle_endtag(self, tag):
+        if tag == "h2":
+            self._in_h2 = False
+            m = re.search(r"第 (\d+) 页", self._h2_text)
+            self._page = int(m.group(1)) if m else 0
+        elif tag in ("td", "th") and self._cell is not None:
+            text, rs, cs = self._cell
+            self.tables[-1][1][-1].append((" ".join(text.split()), rs, cs))
+            self._cell = None
+
+    def handle_data(self, data):
+        if self._in_h2:
+            self._h2_text += data
+        elif self._cell is not None:
+            self._cell[0] += data
+
+
+def parse_tables(html_doc: str) -> List[Tuple[int, List[List[Cell]]]]:
+    """解析完整 HTML 文档，文本已反转义并折叠空白。"""
+    parser = _TableParser()
+    parser.feed(html_doc)
+    parser.close()
+    return parser.tables
+
+
+def diff_tables(expected: str, actual: str, limit: int = 20) -> List[str]:
+    """逐表、逐行、逐单元格比对两份 HTML 文档，返回差异描述（最多 limit 条）。"""
+    exp, act = parse_tables(expected), parse_tables(actual)
+    diffs = []
+    if len(exp) != len(act):
+        diffs.append(f"表格数 {len(exp)} → {len(act)}")
+    for ti, ((ep, erows), (ap, arows)) in enumerate(zip(exp, act), 1):
+        if ep != ap:
+            diffs.append(f"表格 {ti}: 页码 {ep} → {ap}")
+        if len(erows) != len(arows):
+            diffs.append(f"表格 {ti}: 行数 {len(erows)} → {len(arows)}")
+        for ri, (erow, arow) in enumerate(zip(erows, arows), 1):
+            if len(erow) != len(arow):
+                diffs.append(f"表格 {ti} 行 {ri}: 单元格数 {len(erow)} → {len(arow)}")
+            for ci, (ecell, acell) in enumerate(zip(erow, arow), 1):
+                if ecell != acell:
+                    diffs.append(f"表格 {ti} 行 {ri} 格 {ci}: {ecell!r} → {acell!r}")
+    return diffs[:limit]
+
+
+def golden_path(pdf_path: Path) -> Path:
+    return RESULT_DIR / f"test_adaptive_{pdf_path.stem}.html"
+
+
+def run_corpus() -> Dict[str, Dict]:
+    """提取全部示例 PDF，返回 {文件名: {"html", "pages", "seconds"}}。"""
+    results = {}
+    for path in sorted(EXAMPLE_DIR.glob("*.pdf")):
+        with pdfplumber.open(path) as pdf:
+            pages = len(pdf.pages)
+        start = time.perf_counter()
+        tables = ragtable_extract.extract(str(path), use_adaptive_config=True)
+        seconds = time.perf_counter() - start
+        html_doc = ragtable_extract.build_full_html(os.path.basename(path), tables)
+        results[path.name] = {"html": html_doc, "pages": pages, "seconds": seconds}
+    return results
+
+
+def check_golden(results: Dict[str, Dict]) -> Dict[str, List[str]]:
+    """返回 {文件名: 差异列表}，缺少黄金文件时记为一条差异。"""
+    failures = {}
+    for name, r in results.items():
+        golden = golden_path(EXAMPLE_DIR / name)
+        if not golden.exists():
+            failures[name] = [f"缺少黄金文件 {golden.relative_to(ROOT)}"]
+            continue
+        diffs = diff_tables(golden.read_text(encoding="utf-8"), r["html"])
+        if diffs:
+            failures[name] = diffs
+    return failures
+
+
+def pages_per_second(results: Dict[str, Dict]) -> float:
+    pages = sum(r["pages"] for r in results.values())
+    seconds = sum(r["seconds"] for r in results.values())
+    return pages / seconds if seconds else 0.0
+
+
+def throughput_ok(pps: float, baseline: float, tolerance: float) -> bool:
+    """吞吐量不低于 baseline × (1 - tolerance) 视为通过。"""
+    return pps >= baseline * (1 - tolerance)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="黄金输出回归与吞吐量门禁")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="允许吞吐量低于基线的比例（默认 0.5）")
+    parser.add_argument("--repeat", type=int, default=3, help="吞吐量取多轮中的最快一轮")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--update-golden", action="store_true")
+    args = parser.parse_args()
+
+    runs = [run_corpus() for _ in range(max(1, args.repeat))]
+    results = max(runs, key=pages_per_second)
+    ok = True
+
+    if args.update_golden:
+        for name, r in results.items():
+            golden_path(EXAMPLE_DIR / name).write_text(r["html"], encoding="utf-8")
+        print(f"已更新 {len(results)} 个黄金文件")
+    else:
+        failures = check_golden(results)
+        for name, r in results.items():
+            status = "✗" if name in failures else "✓"
+            print(f"{status} {name}: {r['pages']} 页, {r['pages'] / r['seconds']:.1f} pages/s")
+            for d in failures.get(name, []):
+                print(f"    {d}")
+        ok &= not failures
+
+    pps = pages_per_second(results)
+    if args.update_baseline or not BASELINE_PATH.exists():
+        BASELINE_PATH.write_text(json.dumps({"pages_per_sec": round(pps, 2)}) + "\n", encoding="utf-8")
+        print(f"吞吐量基线已写入: {pps:.1f} pages/s")
+    else:
+        baseline = json.loads(BASELINE_PATH.read_text(encoding="utf-8"))["pages_per_sec"]
+        floor = baseline * (1 - args.tolerance)
+        passed = throughput_ok(pps, baseline, args.tolerance)
+        print(f"{'✓' if passed else '✗'} 吞吐量 {pps:.1f} pages/s（基线 {baseline:.1f}，下限 {floor:.1f}）")
+        ok &= passed
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
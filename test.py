@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """测试自适应配置：逐页推算，遍历所有表格所在页面。"""
 
+import json
 import os
 import sys
 from pathlib import Path
@@ -142,9 +143,25 @@ def test_per_page_adaptive():
     return True
 
 
+def test_golden_regression():
+    """黄金输出回归：当前输出与 test/result 逐单元格一致；吞吐量下限按基线与容差判断。"""
+    import regression
+    html = (Path(__file__).parent / "test" / "result" / "test_adaptive_tongbao.html").read_text(encoding="utf-8")
+    drifted = html.replace("公司总部", "公司 总部", 1)
+    assert regression.diff_tables(html, html) == []
+    assert regression.diff_tables(html, drifted) and "公司总部" in regression.diff_tables(html, drifted)[0]
+    assert regression.throughput_ok(10.0, 20.0, 0.5)
+    assert not regression.throughput_ok(9.9, 20.0, 0.5)
+    assert not regression.throughput_ok(13.9, 20.0, 0.3)
+    failures = regression.check_golden(regression.run_corpus())
+    assert not failures, failures
+    print("✓ 黄金输出回归测试通过")
+    return True
+
+
 def test_per_page_adaptive_output():
-    """逐页自适应：提取并输出完整 HTML，便于检查结果。"""
-    output_dir = Path(__file__).parent / "test" / "result"
+    """逐页自适应：提取并输出完整 HTML 到 test/output（不纳入版本库），便于检查结果。"""
+    output_dir = Path(__file__).parent / "test" / "output"
     output_dir.mkdir(parents=True, exist_ok=True)
     outputs = []
     for path, out_name, display_name, _ in _ADAPTIVE_TEST_CASES:
@@ -162,16 +179,378 @@ def test_per_page_adaptive_output():
     return True
 
 
+def test_parse_page_range():
+    """serve/client 页码范围：1-based 字符串 → 0-based 索引。"""
+    from ragtable_extract._server import parse_page_range
+    assert parse_page_range("1-3,5") == [0, 1, 2, 4]
+    assert parse_page_range("") is None
+    try:
+        parse_page_range("0-2")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("0-2 应报错")
+    print("✓ 页码范围解析测试通过")
+    return True
+
+
+def test_server_round_trip():
+    """常驻服务：端口 0 启动，提取结果与本地一致；非法请求体与越界页码返回 400。"""
+    import threading
+    from urllib import error as urlerror
+    from urllib import request as urlrequest
+    from ragtable_extract._server import close_server, make_server, request_extract
+    path = _resolve_path(_ADAPTIVE_TEST_CASES[3][0])
+    if not os.path.exists(path):
+        print("跳过服务测试: PDF 不存在")
+        return True
+    httpd = make_server("127.0.0.1", 0, workers=1)
+    port = httpd.server_address[1]
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        tables = request_extract(path, pages="1", port=port, timeout=60)
+        local = ragtable_extract.extract(path, pages=[0])
+        assert [t["html"] for t in tables] == [t["html"] for t in local]
+        req = urlrequest.Request(f"http://127.0.0.1:{port}/extract", data=b"[1]")
+        try:
+            urlrequest.urlopen(req, timeout=60)
+        except urlerror.HTTPError as e:
+            assert e.code == 400, e.code
+        else:
+            raise AssertionError("非对象请求体应返回 400")
+        try:
+            request_extract(path, pages="999", port=port, timeout=60)
+        except RuntimeError as e:
+            assert "(400)" in str(e), e
+        else:
+            raise AssertionError("越界页码应返回 400")
+    finally:
+        httpd.shutdown()
+        close_server(httpd)
+    print("✓ 常驻服务往返测试通过")
+    return True
+
+
+def test_shard_merge_matches_single_run():
+    """分片规划 → 逐片执行 → 合并，结果应与单次运行一致。"""
+    import tempfile
+    from ragtable_extract._shard import split_balanced
+    assert split_balanced([1, 1, 1, 1], 2) == [[0, 2], [2, 4]]
+    assert split_balanced([1, 1], 5) == [[0, 1], [1, 2]]
+    assert split_balanced([100, 1, 1, 1, 1, 1, 1, 1], 3) == [[0, 1], [1, 5], [5, 8]]
+    path = _resolve_path(_ADAPTIVE_TEST_CASES[3][0])
+    if not os.path.exists(path):
+        print("跳过分片测试: PDF 不存在")
+        return True
+    with tempfile.TemporaryDirectory() as tmp:
+        manifests = ragtable_extract.plan_shards(path, 2, tmp)
+        for m in manifests:
+            ragtable_extract.run_shard(m)
+        merged = ragtable_extract.merge_shards(manifests)
+        # 重新规划会清理旧分片；与 manifest 不一致的旧结果不得合并，执行时应重跑
+        with open(manifests[1].replace(".manifest.json", ".result.json"), encoding="utf-8") as f:
+            stale = f.read()
+        manifests = ragtable_extract.plan_shards(path, 3, tmp)
+        assert sorted(os.listdir(tmp)) == sorted(os.path.basename(m) for m in manifests)
+        with open(manifests[0].replace(".manifest.json", ".result.json"), "w", encoding="utf-8") as f:
+            f.write(stale)
+        for m in manifests[1:]:
+            ragtable_extract.run_shard(m)
+        try:
+            ragtable_extract.merge_shards(manifests)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("旧结果不应被合并")
+        from ragtable_extract.__main__ import _shard_main
+        out = os.path.join(tmp, "merged.html")
+        assert _shard_main(["merge", tmp, out]) == 1 and not os.path.exists(out)
+        with tempfile.TemporaryDirectory() as empty:
+            assert _shard_main(["merge", empty, out]) == 1
+        ragtable_extract.run_shard(manifests[0])
+        assert ragtable_extract.merge_shards(manifests) == merged
+        # 同一路径下的 PDF 被替换：已有结果不得沿用
+        import shutil
+        doc = os.path.join(tmp, "doc.pdf")
+        shutil.copy(path, doc)
+        replanned = ragtable_extract.plan_shards(doc, 2, os.path.join(tmp, "doc"))
+        ragtable_extract.run_shard(replanned[0])
+        shutil.copy(_resolve_path(_ADAPTIVE_TEST_CASES[2][0]), doc)
+        try:
+            ragtable_extract.run_shard(replanned[0])
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("PDF 被替换后不应沿用旧结果")
+    assert merged == ragtable_extract.extract(path)
+    print(f"  {len(manifests)} 个分片，合并 {len(merged)} 表")
+    print("✓ 分片合并测试通过")
+    return True
+
+
+def test_stitch_cross_page():
+    """跨页续表合并：陕西第 7、8 页、浙江第 14、15 页（续表多一条竖线）为同一张表，重复表头只保留一次。"""
+    path = _resolve_path(_ADAPTIVE_TEST_CASES[2][0])
+    if not os.path.exists(path):
+        print("跳过续表合并测试: PDF 不存在")
+        return True
+    plain = ragtable_extract.extract(path)
+    stitched = ragtable_extract.extract(path, stitch=True)
+    assert [t["pages"] for t in stitched] == [[7, 8]]
+    t = stitched[0]
+    assert len(t["raw"]) == len(plain[0]["raw"]) + len(plain[1]["raw"]) - 1
+    assert t["html"].count("<tr>") == len(t["raw"])
+    assert t["html"].count("人文专项") == 1
+    # 可直接作用于 extract() 结果（无 columns，按表头匹配）
+    assert [x["pages"] for x in ragtable_extract.stitch_tables(plain)] == [[7, 8]]
+    zhejiang = _resolve_path(_ADAPTIVE_TEST_CASES[0][0])
+    if os.path.exists(zhejiang):
+        z = ragtable_extract.extract(zhejiang, pages=[13, 14], stitch=True)
+        assert [x["pages"] for x in z] == [[14, 15]]
+        assert z[0]["html"].count("年目标") == 1
+    print("✓ 续表合并测试通过")
+    return True
+
+
+def test_iter_chunks():
+    """RAG 分块：每块重复表头、不超预算（单行块除外），行范围连续覆盖整表。"""
+    import re
+    path = _resolve_path(_ADAPTIVE_TEST_CASES[1][0])
+    if not os.path.exists(path):
+        print("跳过分块测试: PDF 不存在")
+        return True
+    chunks = list(ragtable_extract.iter_chunks(path, max_size=1500))
+    tables = ragtable_extract.extract(path)
+    assert len({c["table_index"] for c in chunks}) == len(tables)
+    for idx, t in enumerate(tables):
+        own = [c for c in chunks if c["table_index"] == idx]
+        header = own[0]["header_rows"]
+        assert own[0]["row_range"][0] == header
+        assert own[-1]["row_range"][1] == len(t["raw"])
+        for prev, cur in zip(own, own[1:]):
+            assert prev["row_range"][1] == cur["row_range"][0]
+        for c in own:
+            assert c["page"] == t["page"]
+            n_rows = c["row_range"][1] - c["row_range"][0]
+            assert len(c["html"]) <= 1500 or n_rows == 1
+            assert c["html"].count("<tr>") == header + n_rows
+            for rs in re.findall(r'rowspan="(\d+)"', c["html"]):
+                assert int(rs) <= header + n_rows
+    # header_rows=0（经 iter_chunks 透传）：无表头，分块恰好不重不漏地覆盖全部行
+    no_header = list(ragtable_extract.iter_chunks(path, max_size=1500, header_rows=0,
+                                                  extraction="simple"))
+    for idx, t in enumerate(tables):
+        own = [c for c in no_header if c["table_index"] == idx]
+        assert own[0]["row_range"][0] == 0 and own[-1]["row_range"][1] == len(t["raw"])
+        assert all(c["header_rows"] == 0 for c in own)
+        assert sum(c["html"].count("<tr>") for c in own) == len(t["raw"])
+    print(f"  {len(tables)} 表 → {len(chunks)} 块")
+    print("✓ RAG 分块测试通过")
+    return True
+
+
+def _async_peak_pages(path, **kwargs):
+    """统计 aextract 运行期间同时处理的最大页数。"""
+    import asyncio
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    from ragtable_extract import _async
+    lock = threading.Lock()
+    state = {"now": 0, "peak": 0}
+    original = _async._extract_page_batch
+
+    def counting(pdf_path, page_numbers, *args):
+        with lock:
+            state["now"] += len(page_numbers)
+            state["peak"] = max(state["peak"], state["now"])
+        try:
+            time.sleep(0.05)
+            return original(pdf_path, page_numbers, *args)
+        finally:
+            with lock:
+                state["now"] -= len(page_numbers)
+
+    async def run():
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            return await ragtable_extract.aextract(path, executor=pool, **kwargs)
+
+    _async._extract_page_batch = counting
+    try:
+        asyncio.run(run())
+    finally:
+        _async._extract_page_batch = original
+    return state["peak"]
+
+
+def test_async_extract():
+    """aextract / aiter_tables：结果与同步 extract 一致（含分批与去重），进度回调，可提前关闭。"""
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+    path = _resolve_path(_ADAPTIVE_TEST_CASES[3][0])
+    if not os.path.exists(path):
+        print("跳过异步测试: PDF 不存在")
+        return True
+    seen = []
+
+    async def run():
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            tables = await ragtable_extract.aextract(
+                path, executor=pool, max_pages_in_flight=2,
+                progress=lambda done, total: seen.append((done, total)),
+            )
+            agen = ragtable_extract.aiter_tables(path, executor=pool)
+            first = await agen.__anext__()
+            await agen.aclose()
+            # 重复页跨批、批内均出现，去重结果应与同步版本一致
+            opts = [
+                await ragtable_extract.aextract(path, pages=dup_pages, executor=pool,
+                                                pages_per_task=k, dedup=mode, extraction="simple")
+                for k, mode in ((1, "reference"), (3, "skip"))
+            ]
+        return tables, first, opts
+
+    dup_pages = [1, 2, 1, 2, 1]
+    tables, first, opts = asyncio.run(run())
+    expected = ragtable_extract.extract(path)
+    assert tables == expected
+    assert first == expected[0]
+    assert seen[-1] == (4, 4)
+    assert _async_peak_pages(path, max_pages_in_flight=1, pages_per_task=4) == 1
+    assert _async_peak_pages(path, max_pages_in_flight=3, pages_per_task=2) <= 3
+    for result, mode in zip(opts, ("reference", "skip")):
+        sync = ragtable_extract.extract(path, pages=dup_pages, dedup=mode, extraction="simple")
+        assert result == sync and sync[0]["shared_pages"] == [2, 2, 2], mode
+    print("✓ 异步提取测试通过")
+    return True
+
+
+def test_regions():
+    """区域限定检测：以整页结果的 bbox 作为区域，输出应与整页检测一致。"""
+    path = _resolve_path(_ADAPTIVE_TEST_CASES[0][0])
+    if not os.path.exists(path):
+        print("跳过区域检测测试: PDF 不存在")
+        return True
+    full = ragtable_extract.extract(path)
+    regions = {}
+    for t in full:
+        x0, top, x1, bottom = t["bbox"]
+        regions.setdefault(t["page"], []).append((x0 - 2, top - 2, x1 + 2, bottom + 2))
+    pages = sorted({t["page"] - 1 for t in full})
+    assert ragtable_extract.extract(path, pages=pages, regions=regions) == full
+    assert ragtable_extract.extract(path, pages=pages, regions={p + 1: [] for p in pages}) == []
+    # 重叠区域合并后检测，同一张表只输出一次
+    t = full[0]
+    x0, top, x1, bottom = t["bbox"]
+    overlapping = {t["page"]: [t["bbox"], (x0 - 1, top - 1, x1 + 1, bottom + 1)]}
+    assert ragtable_extract.extract(path, pages=[t["page"] - 1], regions=overlapping) == [t]
+    # 裁剪页须能回溯到整页，方正字体等按整页判定
+    import pdfplumber
+    from ragtable_extract._core import _crop_region
+    with pdfplumber.open(path) as pdf:
+        page = pdf.pages[full[0]["page"] - 1]
+        assert _crop_region(page, full[0]["bbox"]).root_page is page
+    print("✓ 区域检测测试通过")
+    return True
+
+
+def test_simple_extraction():
+    """extraction="simple"：表格结构与 chars 模式一致，主要文本可提取。"""
+    path, _, _, assertions = _ADAPTIVE_TEST_CASES[3]
+    full_path = _resolve_path(path)
+    if not os.path.exists(full_path):
+        print("跳过 simple 提取测试: PDF 不存在")
+        return True
+    chars = ragtable_extract.extract(full_path)
+    simple = ragtable_extract.extract(full_path, extraction="simple")
+    assert [t["bbox"] for t in simple] == [t["bbox"] for t in chars]
+    for a, b in zip(simple, chars):
+        assert a["html"].count("<td") == b["html"].count("<td")
+    html = "".join(t["html"] for t in simple)
+    for sub, msg in assertions:
+        assert sub in html, msg
+    print("✓ simple 提取测试通过")
+    return True
+
+
+def test_dedup():
+    """重复表格去重：同一页处理两次，第二次应识别为重复且不再提取。"""
+    path = _resolve_path(_ADAPTIVE_TEST_CASES[3][0])
+    if not os.path.exists(path):
+        print("跳过去重测试: PDF 不存在")
+        return True
+    ref = ragtable_extract.extract(path, pages=[1, 2, 1], dedup="reference")
+    assert [t.get("duplicate_of") for t in ref] == [None, None, 0]
+    assert ref[0]["shared_pages"] == [2, 2] and ref[1]["shared_pages"] == [3]
+    assert ref[2]["html"] is ref[0]["html"]
+    skip = ragtable_extract.extract(path, pages=[1, 2, 1], dedup="skip")
+    assert [t["table_id"] for t in skip] == [0, 1]
+    assert [t["html"] for t in skip] == [t["html"] for t in ragtable_extract.extract(path)]
+    # 先比几何指纹：几何各不相同时不计算文本哈希，撞车时才计算
+    from ragtable_extract import _core
+    calls = []
+    original = _core.text_fingerprint
+
+    def counting(*args, **kwargs):
+        calls.append(1)
+        return original(*args, **kwargs)
+
+    _core.text_fingerprint = counting
+    try:
+        ragtable_extract.extract(path, pages=[1, 2], dedup="skip")
+        assert not calls, len(calls)
+        ragtable_extract.extract(path, pages=[1, 2, 1], dedup="skip")
+        assert len(calls) == 2, len(calls)
+    finally:
+        _core.text_fingerprint = original
+    print("✓ 去重测试通过")
+    return True
+
+
+def test_table_record_dict_compat():
+    """TableRecord 是普通 dict，可直接 json.dumps；SpanCell 为 slots 存储，兼容 dict 读取。"""
+    from ragtable_extract._records import SpanCell, TableRecord
+    t = TableRecord(1, (0, 0, 10, 10), "<table></table>", [["序号", None]])
+    assert not hasattr(t, "__dict__")
+    assert t == {"page": 1, "bbox": (0, 0, 10, 10), "html": "<table></table>", "raw": [["序号", None]]}
+    t["pages"] = [1, 2]
+    assert t.get("pages") == [1, 2] and "pages" in t and len(t) == 5
+    assert dict(t.copy()) == dict(t)
+    assert isinstance(t, dict)
+    path = _resolve_path(_ADAPTIVE_TEST_CASES[3][0])
+    if os.path.exists(path):
+        tables = ragtable_extract.extract(path)
+        assert all(isinstance(x, dict) for x in tables)
+        loaded = json.loads(json.dumps(tables, ensure_ascii=False))
+        assert [x["html"] for x in loaded] == [x["html"] for x in tables]
+    c = SpanCell((0, 0, 1, 1), 2, 1)
+    assert c["rowspan"] == 2 and dict(c) == {"bbox": (0, 0, 1, 1), "rowspan": 2, "colspan": 1}
+    print("✓ TableRecord 兼容性测试通过")
+    return True
+
+
 def main():
     print("=== 自适应配置测试 ===\n")
     ok = True
     ok &= test_config_from_metrics()
     ok &= test_config_from_page()
+    ok &= test_parse_page_range()
+    ok &= test_server_round_trip()
+    ok &= test_table_record_dict_compat()
     ok &= test_per_page_adaptive()
     ok &= test_adaptive_zhejiang()
     ok &= test_adaptive_changsha()
     ok &= test_adaptive_shaanxi()
     ok &= test_adaptive_tongbao()
+    ok &= test_shard_merge_matches_single_run()
+    ok &= test_stitch_cross_page()
+    ok &= test_iter_chunks()
+    ok &= test_async_extract()
+    ok &= test_regions()
+    ok &= test_simple_extraction()
+    ok &= test_dedup()
+    ok &= test_golden_regression()
     print()
     ok &= test_per_page_adaptive_output()
     print("\n" + ("全部通过" if ok else "存在失败"))